@@ -1,9 +1,238 @@
 # Copyright (c) 2022, Shridhar Patil and Contributors
 # See license.txt
 
-# import frappe
+from functools import partial
+from unittest.mock import patch
+
+import frappe
+from frappe import _dict
 from frappe.tests import UnitTestCase
 
+from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification import whatsapp_notification
+
+EVOLUTION_SETTINGS = _dict(
+	base_url="https://evolution.example.com",
+	instance_name="test",
+	global_api_key="key",
+)
+
+
+def make_notification(**kwargs):
+	notification = frappe.get_doc({
+		"doctype": "WhatsApp Notification",
+		"notification_name": "_Test WhatsApp Notification",
+		"notification_type": "Scheduler Event",
+		"reference_doctype": "ToDo",
+		"template": "_Test Template",
+		"field_name": "phone",
+		"code": "Hello",
+		**kwargs,
+	})
+	notification._tpl_cache = {"_Test Template": _dict(language_code="en")}
+	notification._evolution_settings_cache = {notification.sender_number: EVOLUTION_SETTINGS}
+	return notification
+
+
+def make_row(name, phone):
+	return _dict(doctype="ToDo", name=name, phone=phone)
+
+
+def post_ok(message):
+	return _dict(
+		status_code=201,
+		response_data={"key": {"id": f"id-{message.phone_number}"}},
+		error_message=None,
+	)
+
 
 class TestWhatsAppNotification(UnitTestCase):
-	pass
+	def send_bulk(self, notification, rows, post=post_ok):
+		"""Run a bulk send, returning saved WhatsApp Messages and the mocked db writes."""
+		saved = []
+		frappe_get_doc = frappe.get_doc
+
+		def get_doc(*args, **kwargs):
+			if args and isinstance(args[0], dict) and args[0].get("doctype") == "WhatsApp Message":
+				saved.append(args[0])
+				return _dict(save=lambda **kw: None)
+			return frappe_get_doc(*args, **kwargs)
+
+		error = None
+		with (
+			patch.object(whatsapp_notification, "post_evolution_request", side_effect=post),
+			patch("frappe.get_doc", side_effect=get_doc),
+			patch.object(frappe.db, "bulk_insert") as bulk_insert,
+			patch.object(frappe.db, "sql") as sql,
+			patch("frappe.clear_document_cache") as clear_document_cache,
+		):
+			try:
+				notification.notify_evolution_bulk(
+					partial(notification.prepare_template_message, row) for row in rows
+				)
+			except Exception as e:
+				error = e
+
+		logs = []
+		if bulk_insert.called:
+			logs = [frappe.parse_json(values[-1]) for values in bulk_insert.call_args.kwargs["values"]]
+		return _dict(
+			saved=saved, logs=logs, bulk_insert=bulk_insert, sql=sql,
+			clear_document_cache=clear_document_cache, error=error,
+		)
+
+	def test_bulk_send_records_results_in_order(self):
+		notification = make_notification()
+		rows = [make_row(f"TD-{i}", f"+{i}00") for i in range(1, 6)]
+
+		with patch.object(whatsapp_notification, "EVOLUTION_BATCH_SIZE", 2):
+			result = self.send_bulk(notification, rows)
+
+		self.assertIsNone(result.error)
+		self.assertEqual([d["to"] for d in result.saved], ["100", "200", "300", "400", "500"])
+		self.assertEqual([d["message_id"] for d in result.saved], [f"id-{i}00" for i in range(1, 6)])
+		self.assertEqual([d["reference_name"] for d in result.saved], [row.name for row in rows])
+		# all logs are written in a single insert
+		result.bulk_insert.assert_called_once()
+		self.assertEqual([log["phone_number"] for log in result.logs], ["100", "200", "300", "400", "500"])
+		self.assertTrue(all(log["success"] for log in result.logs))
+
+	def test_bulk_send_records_failed_responses(self):
+		def post(message):
+			if message.phone_number == "200":
+				return _dict(status_code=400, response_data={"response": {"message": "bad number"}}, error_message=None)
+			if message.phone_number == "300":
+				return _dict(status_code=None, response_data=None, error_message="Connection error: timeout")
+			return post_ok(message)
+
+		notification = make_notification()
+		rows = [make_row("TD-1", "100"), make_row("TD-2", "200"), make_row("TD-3", "300")]
+
+		result = self.send_bulk(notification, rows, post=post)
+
+		self.assertEqual([d["to"] for d in result.saved], ["100"])
+		self.assertEqual([log["success"] for log in result.logs], [True, False, False])
+		self.assertEqual(result.logs[1]["error"], "bad number")
+		self.assertEqual(result.logs[2]["error"], "Connection error: timeout")
+
+	def test_bulk_send_flushes_deferred_writes_on_error(self):
+		def post(message):
+			if message.phone_number == "300":
+				raise RuntimeError("worker crashed")
+			return post_ok(message)
+
+		notification = make_notification(set_property_after_alert="status", property_value="Closed")
+		notification._property_after_alert = ("status", "Closed")
+		rows = [make_row("TD-1", "100"), make_row("TD-2", "200"), make_row("TD-3", "300")]
+
+		result = self.send_bulk(notification, rows, post=post)
+
+		self.assertIsInstance(result.error, RuntimeError)
+		# messages recorded before the failure are still logged and updated
+		self.assertEqual([log["phone_number"] for log in result.logs], ["100", "200"])
+		result.sql.assert_called_once()
+		self.assertIn("UPDATE", str(result.sql.call_args.args[0]).upper())
+		self.assertEqual(
+			[c.args for c in result.clear_document_cache.call_args_list],
+			[("ToDo", "TD-1"), ("ToDo", "TD-2")],
+		)
+		self.assertIsNone(notification._pending_logs)
+		self.assertIsNone(notification._pending_property_updates)
+
+	def test_single_send_does_not_defer_writes(self):
+		notification = make_notification(set_property_after_alert="status", property_value="Closed")
+		notification._property_after_alert = ("status", "Closed")
+
+		with patch.object(frappe.db, "set_value") as set_value:
+			notification.update_property_after_alert(make_row("TD-1", "100"))
+
+		set_value.assert_called_once_with("ToDo", "TD-1", "status", "Closed", update_modified=False)
+
+	def test_bulk_send_keeps_going_when_a_message_fails_to_build(self):
+		notification = make_notification()
+		rows = [make_row("TD-1", "+111"), make_row("TD-2", None), make_row("TD-3", "333")]
+
+		result = self.send_bulk(notification, rows)
+
+		self.assertIsNone(result.error)
+		self.assertEqual([d["to"] for d in result.saved], ["111", "333"])
+		self.assertEqual([log["success"] for log in result.logs], [False, True, True])
+		self.assertIn("Phone number not found", result.logs[0]["error"])
+
+	def test_plain_parameters_replace_empty_values_with_blank(self):
+		notification = make_notification(code="Hi {{1}}!", fields=[{"field_name": "allocated_to"}])
+		row = make_row("TD-1", "111")
+		row.allocated_to = None
+
+		message = notification.prepare_template_message(row)
+
+		self.assertEqual(message.message_text, "Hi !")
+		self.assertEqual(message.parameters, [""])
+
+	def test_needs_formatted_values(self):
+		self.assertFalse(make_notification(fields=[{"field_name": "allocated_to"}]).needs_formatted_values())
+		self.assertTrue(make_notification(fields=[{"field_name": "date"}]).needs_formatted_values())
+		# standard fields have no docfield and are formatted by the document
+		self.assertTrue(make_notification(fields=[{"field_name": "creation"}]).needs_formatted_values())
+
+	def test_needs_full_document(self):
+		self.assertFalse(make_notification().needs_full_document())
+		self.assertTrue(make_notification(condition="doc.status == 'Open'").needs_full_document())
+		self.assertTrue(make_notification(attach_document_print=1).needs_full_document())
+		self.assertTrue(
+			make_notification(custom_attachment=1, attach_from_field="attachment").needs_full_document()
+		)
+		self.assertFalse(make_notification(custom_attachment=1, attach="/files/a.png").needs_full_document())
+
+	def test_documents_for_today_loading_path(self):
+		def get_all_fields(notification):
+			with (
+				patch("frappe.get_all", return_value=[]) as get_all,
+				patch.object(notification, "notify_evolution_bulk"),
+			):
+				notification.get_documents_for_today()
+			return get_all.call_args.kwargs["fields"]
+
+		base = {"doctype_event": "Days Before", "days_in_advance": 1, "date_changed": "date"}
+
+		self.assertEqual(get_all_fields(make_notification(condition="doc.status == 'Open'", **base)), "name")
+		self.assertEqual(get_all_fields(make_notification(fields=[{"field_name": "date"}], **base)), ["*"])
+		self.assertEqual(
+			set(get_all_fields(make_notification(fields=[{"field_name": "allocated_to"}], **base))),
+			{"name", "phone", "allocated_to"},
+		)
+
+	def test_bulk_send_logs_known_phone_number_of_failed_build(self):
+		notification = make_notification()
+		notification._tpl_cache = {"_Test Template": None}
+
+		result = self.send_bulk(notification, [make_row("TD-1", "+111")])
+
+		self.assertIsNone(result.error)
+		self.assertEqual(result.saved, [])
+		self.assertEqual(result.logs[0]["phone_number"], "111")
+		self.assertIn("not found", result.logs[0]["error"])
+
+	def test_bulk_send_stops_on_unexpected_build_error(self):
+		notification = make_notification()
+		rows = [make_row("TD-1", "111"), make_row("TD-2", "222")]
+
+		# stands in for a database error such as a lock wait timeout
+		with patch.object(notification, "format_number", side_effect=["111", RuntimeError("lock wait timeout")]):
+			result = self.send_bulk(notification, rows)
+
+		self.assertIsInstance(result.error, RuntimeError)
+		self.assertEqual(result.saved, [])
+
+	def test_evolution_urls_follow_sender_number(self):
+		notification = make_notification(sender_number="first")
+		notification._evolution_settings_cache = {
+			"first": _dict(base_url="https://one.example.com", instance_name="one", global_api_key="key"),
+			"second": _dict(base_url="https://two.example.com", instance_name="two", global_api_key="key"),
+		}
+
+		message = notification.build_evolution_request(_dict(phone_number="111", message_text="Hi"))
+		self.assertEqual(message.url, "https://one.example.com/message/sendText/one")
+
+		notification.sender_number = "second"
+		message = notification.build_evolution_request(_dict(phone_number="111", message_text="Hi"))
+		self.assertEqual(message.url, "https://two.example.com/message/sendText/two")
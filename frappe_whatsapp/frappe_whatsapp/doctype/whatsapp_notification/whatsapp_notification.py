@@ -1,9 +1,15 @@
 """Notification."""
 
 import base64
-import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 import frappe
 
@@ -11,7 +17,88 @@ from frappe import _dict, _
 from frappe.model.document import Document
 from frappe.utils.safe_exec import get_safe_globals, safe_exec
 from frappe.integrations.utils import make_post_request
-from frappe.utils import add_to_date, nowdate, datetime
+from frappe.utils import add_to_date, get_datetime, nowdate, datetime
+
+# fieldtypes whose raw value is identical to its formatted value
+PLAIN_FIELDTYPES = ("Data", "Link", "Dynamic Link", "Phone")
+
+# template placeholders like {{1}}, {{2}}
+PARAM_RE = re.compile(r"\{\{(\d+)\}\}")
+
+# concurrent HTTP requests to Evolution API during bulk sends
+EVOLUTION_MAX_WORKERS = 16
+# messages prepared and held in memory at once during bulk sends,
+# print attachments use EVOLUTION_MAX_WORKERS instead
+EVOLUTION_BATCH_SIZE = 64
+
+# cached notifications run by trigger_notifications
+DAILY_NOTIFICATIONS_CACHE_KEY = "whatsapp_daily_notifications"
+DAILY_NOTIFICATIONS_CACHE_EXPIRY = 60 * 60
+
+_evolution_session = None
+_evolution_session_lock = threading.Lock()
+
+
+def get_site_url():
+    """Get the site URL, resolved once per request."""
+    if not getattr(frappe.local, "whatsapp_site_url", None):
+        frappe.local.whatsapp_site_url = frappe.utils.get_url()
+
+    return frappe.local.whatsapp_site_url
+
+
+def get_evolution_session():
+    """Get a pooled requests session shared by all Evolution API calls."""
+    global _evolution_session
+    if _evolution_session is None:
+        with _evolution_session_lock:
+            if _evolution_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _evolution_session = session
+
+    return _evolution_session
+
+
+def post_evolution_request(message):
+    """POST a built Evolution API message, safe to call from worker threads."""
+    result = _dict(status_code=None, response_data=None, error_message=None)
+    try:
+        response = get_evolution_session().post(
+            message.url, headers=message.headers, data=orjson.dumps(message.payload), timeout=30
+        )
+        result.status_code = response.status_code
+        result.response_data = orjson.loads(response.content)
+    except requests.exceptions.RequestException as e:
+        result.error_message = f"Connection error: {str(e)}"
+    except Exception as e:
+        result.error_message = str(e)
+
+    return result
+
+
+def get_default_print_format(doctype):
+    """Get the default print format of doctype, falling back to Standard."""
+    print_format = "Standard"
+    meta = frappe.get_cached_doc("DocType", doctype)
+
+    if meta.custom:
+        if meta.default_print_format:
+            print_format = meta.default_print_format
+    else:
+        default_print_format = frappe.db.get_value(
+            "Property Setter",
+            filters={
+                "doc_type": doctype,
+                "property": "default_print_format"
+            },
+            fieldname="value"
+        )
+        print_format = default_print_format if default_print_format else print_format
+
+    return print_format
 
 
 class WhatsAppNotification(Document):
@@ -20,13 +107,8 @@ class WhatsAppNotification(Document):
     def validate(self):
         """Validate."""
         if self.notification_type == "DocType Event":
-            fields = frappe.get_doc("DocType", self.reference_doctype).fields
-            fields += frappe.get_all(
-                "Custom Field",
-                filters={"dt": self.reference_doctype},
-                fields=["fieldname"]
-            )
-            if not any(field.fieldname == self.field_name for field in fields): # noqa
+            # meta is cached and already includes custom fields
+            if not frappe.get_meta(self.reference_doctype).has_field(self.field_name):
                 frappe.throw(_("Field name {0} does not exists").format(self.field_name))
         if self.custom_attachment:
             if not self.attach and not self.attach_from_field:
@@ -44,16 +126,80 @@ class WhatsAppNotification(Document):
                 ))
 
 
+    def get_template(self):
+        """Get the linked WhatsApp Template, cached for this instance."""
+        if not hasattr(self, "_tpl_cache"):
+            self._tpl_cache = {}
+
+        if not self.template:
+            return None
+
+        if self.template not in self._tpl_cache:
+            try:
+                self._tpl_cache[self.template] = frappe.get_cached_doc(
+                    "WhatsApp Templates", self.template
+                )
+            except frappe.DoesNotExistError:
+                frappe.clear_last_message()
+                self._tpl_cache[self.template] = None
+
+        return self._tpl_cache[self.template]
+
+    def get_evolution_settings(self):
+        """Get the sender's Evolution Phone Settings, cached for this instance."""
+        if not hasattr(self, "_evolution_settings_cache"):
+            self._evolution_settings_cache = {}
+
+        if self.sender_number not in self._evolution_settings_cache:
+            self._evolution_settings_cache[self.sender_number] = frappe.get_cached_doc(
+                "Evolution Phone Settings", self.sender_number
+            )
+
+        return self._evolution_settings_cache[self.sender_number]
+
+    def get_whatsapp_settings(self):
+        """Get WhatsApp Settings, cached for this instance."""
+        if not hasattr(self, "_whatsapp_settings"):
+            self._whatsapp_settings = frappe.get_cached_doc(
+                "WhatsApp Settings", "WhatsApp Settings"
+            )
+
+        return self._whatsapp_settings
+
+    def get_field_names(self):
+        """Get template parameter fieldnames in order, built once for this instance."""
+        if not hasattr(self, "_field_names"):
+            self._field_names = [field.field_name for field in self.fields]
+
+        return self._field_names
+
+    def get_condition_globals(self):
+        """Get safe globals for evaluating the condition, built once for this instance."""
+        if not hasattr(self, "_condition_globals"):
+            self._condition_globals = get_safe_globals()
+
+        return self._condition_globals
+
+    def get_print_format(self, doctype):
+        """Get the print format to attach for doctype, resolved once for this instance."""
+        if not hasattr(self, "_print_format"):
+            self._print_format = {}
+
+        if doctype not in self._print_format:
+            self._print_format[doctype] = get_default_print_format(doctype)
+
+        return self._print_format[doctype]
+
     def send_scheduled_message(self) -> dict:
         """Specific to API endpoint Server Scripts."""
+        if self.disabled:
+            return
+
         safe_exec(
             self.condition, get_safe_globals(), dict(doc=self)
         )
 
-        template = frappe.db.get_value(
-            "WhatsApp Templates", self.template,
-            fieldname='*'
-        )
+        template = self.get_template()
 
         if template and template.language_code:
             if self.get("_contact_list"):
@@ -62,10 +208,13 @@ class WhatsAppNotification(Document):
             elif self.get("_data_list"):
                 # allow send a dynamic template using schedule event config
                 # _doc_list shoud be [{"name": "xxx", "phone_no": "123"}]
-                for data in self._data_list:
-                    doc = frappe.get_doc(self.reference_doctype, data.get("name"))
-
-                    self.send_template_message(doc, data.get("phone_no"), template, True)
+                self.notify_evolution_bulk(
+                    partial(
+                        self.prepare_reference_message,
+                        data.get("name"), data.get("phone_no"), template, True
+                    )
+                    for data in self._data_list
+                )
         # return _globals.frappe.flags
 
 
@@ -90,20 +239,37 @@ class WhatsAppNotification(Document):
 
     def send_template_message(self, doc: Document, phone_no=None, default_template=None, ignore_condition=False):
         """Send WhatsApp message using Evolution API instead of Meta."""
+        message = self.prepare_template_message(doc, phone_no, default_template, ignore_condition)
+        if message:
+            self.notify_evolution(**message)
+
+    def prepare_reference_message(self, name, phone_no=None, default_template=None, ignore_condition=False):
+        """Load a reference document and build its Evolution API message."""
+        doc = frappe.get_doc(self.reference_doctype, name)
+        return self.prepare_template_message(doc, phone_no, default_template, ignore_condition)
+
+    def prepare_row_message(self, row):
+        """Build a reference document from a queried row and build its Evolution API message."""
+        doc = frappe.get_doc(dict(row, doctype=self.reference_doctype))
+        return self.prepare_template_message(doc)
+
+    def prepare_template_message(self, doc: Document, phone_no=None, default_template=None, ignore_condition=False):
+        """Build the Evolution API message for a doc, returns None if it should not be sent."""
         if self.disabled:
             return
 
-        doc_data = doc.as_dict()
+        doc_data = doc
         if self.condition and not ignore_condition:
             # check if condition satisfies
             if not frappe.safe_eval(
-                self.condition, get_safe_globals(), dict(doc=doc_data)
+                self.condition, self.get_condition_globals(),
+                dict(doc=doc.as_dict() if isinstance(doc, Document) else doc)
             ):
                 return
 
         # Get phone number
         if self.field_name:
-            phone_number = phone_no or doc_data[self.field_name]
+            phone_number = phone_no or doc_data.get(self.field_name)
         else:
             phone_number = phone_no
 
@@ -112,12 +278,10 @@ class WhatsAppNotification(Document):
 
         # Format phone number
         phone_number = self.format_number(phone_number)
+        self._preparing_phone_number = phone_number
 
         # Build message text with template parameters
-        template = default_template or frappe.db.get_value(
-            "WhatsApp Templates", self.template,
-            fieldname='*'
-        )
+        template = default_template or self.get_template()
 
         if not template:
             frappe.throw(f"Template {self.template} not found")
@@ -129,56 +293,47 @@ class WhatsAppNotification(Document):
 
         # Replace parameters in template
         if self.fields:
-            parameters = []
-            for field in self.fields:
-                if isinstance(doc, Document):
-                    value = doc.get_formatted(field.field_name)
-                else:
-                    value = doc_data[field.field_name]
-                    if isinstance(doc_data[field.field_name], (datetime.date, datetime.datetime)):
-                        value = str(doc_data[field.field_name])
-                parameters.append(value)
-
-            # Replace {{1}}, {{2}}, etc. with actual values
-            for i, param in enumerate(parameters, 1):
-                message_text = message_text.replace(f"{{{{{i}}}}}", _(str(param),'ar'))
+            if isinstance(doc, Document):
+                parameters = [doc.get_formatted(fieldname) for fieldname in self.get_field_names()]
+            else:
+                # match get_formatted, which returns "" for empty values
+                date_types = (datetime.date, datetime.datetime)
+                parameters = []
+                for fieldname in self.get_field_names():
+                    value = doc_data.get(fieldname)
+                    if value is None:
+                        value = ""
+                    parameters.append(str(value) if isinstance(value, date_types) else value)
+
+            # Replace {{1}}, {{2}}, etc. with actual values in a single pass
+            def replace_param(match):
+                index = int(match.group(1)) - 1
+                if 0 <= index < len(parameters):
+                    return _(str(parameters[index]), 'ar')
+                return match.group(0)
+
+            message_text = PARAM_RE.sub(replace_param, message_text)
 
         # Handle attachments
         attachment_url = None
         filename = None
 
         if self.attach_document_print:
-            print_format = "Standard"
-            doctype = frappe.get_doc("DocType", doc_data['doctype'])
-
-            if doctype.custom:
-                if doctype.default_print_format:
-                    print_format = doctype.default_print_format
-            else:
-                default_print_format = frappe.db.get_value(
-                    "Property Setter",
-                    filters={
-                        "doc_type": doc_data['doctype'],
-                        "property": "default_print_format"
-                    },
-                    fieldname="value"
-                )
-                print_format = default_print_format if default_print_format else print_format
+            print_format = self.get_print_format(doc_data.get('doctype'))
 
             # Generate PDF using attach_print (handles permissions and PDF generation properly)
             try:
                 pdf_data = frappe.attach_print(
-                    doc_data['doctype'],
-                    doc_data['name'],
+                    doc_data.get('doctype'),
+                    doc_data.get('name'),
                     print_format=print_format,
                     doc=doc
                 )
                 
-                # Convert PDF to base64
-                pdf_base64 = base64.b64encode(pdf_data["fcontent"]).decode('utf-8')
-                
+                # Evolution expects the document inline as base64; encode once and
+                # drop the raw bytes so only one copy of the PDF stays in memory
                 filename = pdf_data["fname"]
-                attachment_url = pdf_base64
+                attachment_url = base64.b64encode(pdf_data.pop("fcontent")).decode("ascii")
             except Exception as e:
                 error_msg = str(e)
                 # Handle network/localhost errors with helpful message
@@ -194,20 +349,19 @@ class WhatsAppNotification(Document):
             filename = self.file_name
 
             if self.attach_from_field:
-                file_url = doc_data[self.attach_from_field]
+                file_url = doc_data.get(self.attach_from_field)
                 if not file_url.startswith("http"):
                     key = doc.get_document_share_key()
-                    file_url = f'{frappe.utils.get_url()}{file_url}&key={key}'
+                    file_url = f'{get_site_url()}{file_url}&key={key}'
             else:
                 file_url = self.attach
 
             if file_url.startswith("http"):
                 attachment_url = file_url
             else:
-                attachment_url = f'{frappe.utils.get_url()}{file_url}'
+                attachment_url = f'{get_site_url()}{file_url}'
 
-        # Send message using Evolution API
-        self.notify_evolution(
+        return _dict(
             phone_number=phone_number,
             message_text=message_text,
             attachment_url=attachment_url,
@@ -220,63 +374,148 @@ class WhatsAppNotification(Document):
     def notify_evolution(self, phone_number, message_text, attachment_url=None,
                          filename=None, template=None, doc_data=None, parameters=None):
         """Send message via Evolution API."""
+        message = _dict(
+            phone_number=phone_number,
+            message_text=message_text,
+            attachment_url=attachment_url,
+            filename=filename,
+            template=template,
+            doc_data=doc_data,
+            parameters=parameters
+        )
+        self.build_evolution_request(message)
+        self.record_evolution_response(message, post_evolution_request(message))
+
+    def notify_evolution_bulk(self, prepares):
+        """Send messages via Evolution API concurrently.
+
+        `prepares` yields callables that build one message each, so a
+        message failing to build is logged and skipped without dropping
+        the rest of its batch. Only the HTTP requests run in worker threads,
+        WhatsApp Message and log records are written on the main thread
+        once a batch resolves.
+        """
+        messages = (message for message in map(self.try_prepare_message, prepares) if message)
+        self._pending_property_updates = {}
+        self._pending_logs = []
+        # create the shared session here rather than in the first worker thread
+        get_evolution_session()
+        # base64 PDFs are large, only hold as many as can be in flight at once
+        batch_size = EVOLUTION_MAX_WORKERS if self.attach_document_print else EVOLUTION_BATCH_SIZE
+        try:
+            with ThreadPoolExecutor(max_workers=EVOLUTION_MAX_WORKERS) as executor:
+                while batch := list(islice(messages, batch_size)):
+                    for message in batch:
+                        self.build_evolution_request(message)
 
-        evolution_settings = frappe.get_doc("Evolution Phone Settings", self.sender_number)
+                    for message, result in zip(batch, executor.map(post_evolution_request, batch)):
+                        self.record_evolution_response(message, result)
+        finally:
+            self.flush_property_updates()
+            self.flush_logs()
+
+    def try_prepare_message(self, prepare):
+        """Build a message for a bulk send, logging expected build failures.
+
+        Validation errors (missing phone or template) and attachment/PDF
+        errors skip the message, anything else such as a database error
+        stops the send.
+        """
+        self._preparing_phone_number = None
+        try:
+            return prepare()
+        except (frappe.ValidationError, OSError) as e:
+            error_message = str(e)
+            if not isinstance(e, frappe.ValidationError):
+                # frappe.throw has already shown the message
+                frappe.msgprint(
+                    f"Failed to trigger WhatsApp message: {error_message}",
+                    indicator="red",
+                    alert=True
+                )
+            self.log_notification({
+                "success": False,
+                "response": None,
+                "error": error_message,
+                "phone_number": self._preparing_phone_number,
+                "message": None
+            })
+
+    def build_evolution_request(self, message):
+        """Set url, headers, payload and content type of an Evolution API message."""
+        evolution_settings = self.get_evolution_settings()
 
         if not evolution_settings.base_url or not evolution_settings.instance_name:
             frappe.throw("Evolution Phone Settings not configured")
 
-        headers = {
+        if not hasattr(self, "_ev_urls"):
+            self._ev_urls = {}
+
+        if self.sender_number not in self._ev_urls:
+            base_url = f"{evolution_settings.base_url}/message"
+            self._ev_urls[self.sender_number] = _dict(
+                send_media=f"{base_url}/sendMedia/{evolution_settings.instance_name}",
+                send_text=f"{base_url}/sendText/{evolution_settings.instance_name}",
+            )
+        ev_urls = self._ev_urls[self.sender_number]
+
+        message.headers = {
             "Content-Type": "application/json",
             "apikey": evolution_settings.global_api_key
         }
 
-        success = False
-        response_data = None
-        error_message = None
-
-        try:
-            # Determine content type and endpoint
-            if attachment_url:
-                # Check if it's a document (PDF) or image
-                if filename and filename.lower().endswith('.pdf'):
-                    # Send document
-                    url = f"{evolution_settings.base_url}/message/sendMedia/{evolution_settings.instance_name}"
-                    payload = {
-                        "number": phone_number,
-                        "mediatype": "document",
-                        "mimetype": "application/pdf",
-                        "caption": message_text,
-                        "media": attachment_url,
-                        "fileName": filename
-                    }
-                    content_type = 'document'
-                else:
-                    # Send image
-                    url = f"{evolution_settings.base_url}/message/sendMedia/{evolution_settings.instance_name}"
-                    payload = {
-                        "number": phone_number,
-                        "mediatype": "image",
-                        "caption": message_text,
-                        "media": attachment_url
-                    }
-                    content_type = 'image'
+        # Determine content type and endpoint
+        if message.attachment_url:
+            message.url = ev_urls.send_media
+            # Check if it's a document (PDF) or image
+            if message.filename and message.filename.lower().endswith('.pdf'):
+                # Send document
+                message.payload = {
+                    "number": message.phone_number,
+                    "mediatype": "document",
+                    "mimetype": "application/pdf",
+                    "caption": message.message_text,
+                    "media": message.attachment_url,
+                    "fileName": message.filename
+                }
+                message.content_type = 'document'
             else:
-                if message_text is None:
-                    message_text = 'No Text'
-                # Send text message
-                url = f"{evolution_settings.base_url}/message/sendText/{evolution_settings.instance_name}"
-                payload = {
-                    "number": phone_number,
-                    "text": message_text
+                # Send image
+                message.payload = {
+                    "number": message.phone_number,
+                    "mediatype": "image",
+                    "caption": message.message_text,
+                    "media": message.attachment_url
                 }
-                content_type = 'text'
+                message.content_type = 'image'
+        else:
+            if message.message_text is None:
+                message.message_text = 'No Text'
+            # Send text message
+            message.url = ev_urls.send_text
+            message.payload = {
+                "number": message.phone_number,
+                "text": message.message_text
+            }
+            message.content_type = 'text'
 
-            # Make request to Evolution API
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            response_data = response.json()
+        return message
 
-            if response.status_code in [200, 201]:
+    def record_evolution_response(self, message, result):
+        """Create WhatsApp Message and log records for an Evolution API response."""
+        success = False
+        response_data = result.response_data
+        error_message = result.error_message
+        doc_data = message.doc_data
+
+        try:
+            if error_message:
+                frappe.msgprint(
+                    f"Failed to trigger WhatsApp message: {error_message}",
+                    indicator="red",
+                    alert=True
+                )
+            elif result.status_code in [200, 201]:
                 success = True
 
                 # Extract message ID from response
@@ -288,14 +527,14 @@ class WhatsAppNotification(Document):
                 new_doc = {
                     "doctype": "WhatsApp Message",
                     "type": "Outgoing",
-                    "message": message_text,
-                    "to": phone_number,
+                    "message": message.message_text,
+                    "to": message.phone_number,
                     "message_type": "Template",
                     "message_id": message_id,
-                    "content_type": content_type,
+                    "content_type": message.content_type,
                     "use_template": 1,
                     "template": self.template,
-                    "template_parameters": frappe.json.dumps(parameters, default=str) if parameters else None
+                    "template_parameters": orjson.dumps(message.parameters, default=str).decode() if message.parameters else None
                 }
 
                 if doc_data:
@@ -307,21 +546,7 @@ class WhatsAppNotification(Document):
                 frappe.get_doc(new_doc).save(ignore_permissions=True)
 
                 # Update property after alert if configured
-                if doc_data and self.set_property_after_alert and self.property_value:
-                    if doc_data.get("doctype") and doc_data.get("name"):
-                        fieldname = self.set_property_after_alert
-                        value = self.property_value
-                        meta = frappe.get_meta(doc_data.get("doctype"))
-                        df = meta.get_field(fieldname)
-                        if df:
-                            if df.fieldtype in frappe.model.numeric_fieldtypes:
-                                value = frappe.utils.cint(value)
-                            frappe.db.set_value(
-                                doc_data.get("doctype"),
-                                doc_data.get("name"),
-                                fieldname,
-                                value
-                            )
+                self.update_property_after_alert(doc_data)
 
                 frappe.msgprint("WhatsApp Message Sent Successfully", indicator="green", alert=True)
             else:
@@ -332,13 +557,6 @@ class WhatsAppNotification(Document):
                     alert=True
                 )
 
-        except requests.exceptions.RequestException as e:
-            error_message = f"Connection error: {str(e)}"
-            frappe.msgprint(
-                f"Failed to trigger WhatsApp message: {error_message}",
-                indicator="red",
-                alert=True
-            )
         except Exception as e:
             error_message = str(e)
             frappe.msgprint(
@@ -348,23 +566,101 @@ class WhatsAppNotification(Document):
             )
         finally:
             # Log the notification
-            frappe.get_doc({
-                "doctype": "WhatsApp Notification Log",
-                "template": self.template,
-                "meta_data": {
-                    "success": success,
-                    "response": response_data if success else None,
-                    "error": error_message if not success else None,
-                    "phone_number": phone_number,
-                    "message": message_text
-                }
-            }).insert(ignore_permissions=True)
+            self.log_notification({
+                "success": success,
+                "response": response_data if success else None,
+                "error": error_message if not success else None,
+                "phone_number": message.phone_number,
+                "message": message.message_text
+            })
+
+    def log_notification(self, meta):
+        """Create a WhatsApp Notification Log, deferred to flush_logs during bulk sends."""
+        pending = getattr(self, "_pending_logs", None)
+        if pending is not None:
+            now = frappe.utils.now()
+            pending.append((
+                frappe.generate_hash(length=10), now, now,
+                frappe.session.user, frappe.session.user,
+                self.template, frappe.as_json(meta)
+            ))
+            return
+
+        frappe.get_doc({
+            "doctype": "WhatsApp Notification Log",
+            "template": self.template,
+            "meta_data": meta
+        }).insert(ignore_permissions=True)
+
+    def flush_logs(self):
+        """Insert logs collected during a bulk send in one query."""
+        pending = getattr(self, "_pending_logs", None)
+        self._pending_logs = None
+        if not pending:
+            return
+
+        frappe.db.bulk_insert(
+            "WhatsApp Notification Log",
+            fields=["name", "creation", "modified", "owner", "modified_by", "template", "meta_data"],
+            values=pending
+        )
+
+    def get_property_after_alert(self):
+        """Get (fieldname, value) to set after an alert, resolved once for this instance."""
+        if not hasattr(self, "_property_after_alert"):
+            self._property_after_alert = None
+            if self.set_property_after_alert and self.property_value:
+                df = frappe.get_meta(self.reference_doctype).get_field(self.set_property_after_alert)
+                if df:
+                    value = self.property_value
+                    if df.fieldtype in frappe.model.numeric_fieldtypes:
+                        value = frappe.utils.cint(value)
+                    self._property_after_alert = (df.fieldname, value)
+
+        return self._property_after_alert
+
+    def update_property_after_alert(self, doc_data):
+        """Set the configured property on the alerted document."""
+        if not doc_data or not doc_data.get("doctype") or not doc_data.get("name"):
+            return
+
+        property_after_alert = self.get_property_after_alert()
+        if not property_after_alert:
+            return
+
+        fieldname, value = property_after_alert
+        pending = getattr(self, "_pending_property_updates", None)
+        if pending is not None:
+            # bulk send, written in one query by flush_property_updates
+            pending.setdefault((doc_data.get("doctype"), fieldname, value), []).append(doc_data.get("name"))
+        else:
+            frappe.db.set_value(
+                doc_data.get("doctype"), doc_data.get("name"), fieldname, value,
+                update_modified=False
+            )
+
+    def flush_property_updates(self):
+        """Write properties collected during a bulk send, one UPDATE per doctype and value."""
+        pending = getattr(self, "_pending_property_updates", None)
+        self._pending_property_updates = None
+        if not pending:
+            return
+
+        for (doctype, fieldname, value), names in pending.items():
+            table = frappe.qb.DocType(doctype)
+            (
+                frappe.qb.update(table)
+                .set(table[fieldname], value)
+                .where(table.name.isin(names))
+            ).run()
+
+            # frappe.db.set_value clears these, a raw UPDATE does not
+            for name in names:
+                frappe.clear_document_cache(doctype, name)
 
     def notify(self, data, doc_data=None):
         """Notify."""
-        settings = frappe.get_doc(
-            "WhatsApp Settings", "WhatsApp Settings",
-        )
+        settings = self.get_whatsapp_settings()
         token = settings.get_password("token")
 
         headers = {
@@ -375,7 +671,7 @@ class WhatsAppNotification(Document):
             success = False
             response = make_post_request(
                 f"{settings.url}/{settings.version}/{settings.phone_id}/messages",
-                headers=headers, data=json.dumps(data)
+                headers=headers, data=orjson.dumps(data)
             )
 
             if not self.get("content_type"):
@@ -384,7 +680,7 @@ class WhatsAppNotification(Document):
             parameters = None
             if data["template"]["components"]:
                 parameters = [param["text"] for param in data["template"]["components"][0]["parameters"]]
-                parameters = frappe.json.dumps(parameters, default=str)
+                parameters = orjson.dumps(parameters, default=str).decode()
 
             new_doc = {
                 "doctype": "WhatsApp Message",
@@ -407,17 +703,7 @@ class WhatsAppNotification(Document):
 
             frappe.get_doc(new_doc).save(ignore_permissions=True)
 
-            if doc_data and self.set_property_after_alert and self.property_value:
-                if doc_data.doctype and doc_data.name:
-                    fieldname = self.set_property_after_alert
-                    value = self.property_value
-                    meta = frappe.get_meta(doc_data.get("doctype"))
-                    df = meta.get_field(fieldname)
-                    if df:
-                        if df.fieldtype in frappe.model.numeric_fieldtypes:
-                            value = frappe.utils.cint(value)
-
-                        frappe.db.set_value(doc_data.get("doctype"), doc_data.get("name"), fieldname, value)
+            self.update_property_after_alert(doc_data)
 
             frappe.msgprint("WhatsApp Message Triggered", indicator="green", alert=True)
             success = True
@@ -438,50 +724,86 @@ class WhatsAppNotification(Document):
                 meta = {"error": error_message}
             else:
                 meta = frappe.flags.integration_request.json()
-            frappe.get_doc({
-                "doctype": "WhatsApp Notification Log",
-                "template": self.template,
-                "meta_data": meta
-            }).insert(ignore_permissions=True)
+            self.log_notification(meta)
 
 
+    def on_change(self):
+        """On change refresh schedule."""
+        clear_notifications_cache()
+
+    def after_rename(self, old, new, merge=False):
+        """On rename refresh schedule."""
+        clear_notifications_cache()
+
     def on_trash(self):
         """On delete remove from schedule."""
-        frappe.cache().delete_value("whatsapp_notification_map")
+        clear_notifications_cache()
 
 
     def format_number(self, number):
         """Format number."""
-        if (number.startswith("+")):
-            number = number[1:len(number)]
-
-        return number
+        return number[1:] if number.startswith("+") else number
 
     def get_documents_for_today(self):
         """get list of documents that will be triggered today"""
-        docs = []
+        if self.disabled:
+            return
 
         diff_days = self.days_in_advance
         if self.doctype_event == "Days After":
             diff_days = -diff_days
 
         reference_date = add_to_date(nowdate(), days=diff_days)
-        reference_date_start = reference_date + " 00:00:00.000000"
-        reference_date_end = reference_date + " 23:59:59.000000"
-
-        doc_list = frappe.get_all(
-            self.reference_doctype,
-            fields="name",
-            filters=[
-                {self.date_changed: (">=", reference_date_start)},
-                {self.date_changed: ("<=", reference_date_end)},
-            ],
+        reference_date_start = get_datetime(reference_date).replace(hour=0, minute=0, second=0, microsecond=0)
+        reference_date_end = reference_date_start + datetime.timedelta(days=1, microseconds=-1)
+
+        filters = [
+            {self.date_changed: (">=", reference_date_start)},
+            {self.date_changed: ("<=", reference_date_end)},
+        ]
+
+        if self.needs_full_document():
+            # print formats, share keys and conditions may touch child tables
+            doc_list = frappe.get_all(self.reference_doctype, fields="name", filters=filters)
+            prepares = (partial(self.prepare_reference_message, d.name) for d in doc_list)
+        elif self.needs_formatted_values():
+            # build documents from a single query, get_formatted only needs the row
+            doc_list = frappe.get_all(self.reference_doctype, fields=["*"], filters=filters)
+            prepares = (partial(self.prepare_row_message, d) for d in doc_list)
+        else:
+            needed = {"name", self.field_name, self.set_property_after_alert}
+            needed.update(field.field_name for field in self.fields)
+            needed.discard(None)
+            needed.discard("")
+
+            doc_list = frappe.get_all(self.reference_doctype, fields=list(needed), filters=filters)
+            for d in doc_list:
+                d.doctype = self.reference_doctype
+            prepares = (partial(self.prepare_template_message, d) for d in doc_list)
+
+        self.notify_evolution_bulk(prepares)
+
+    def needs_full_document(self):
+        """Check if sending requires the complete document loaded from the database."""
+        return bool(
+            self.attach_document_print
+            or self.condition
+            or (self.custom_attachment and self.attach_from_field)
         )
 
-        for d in doc_list:
-            doc = frappe.get_doc(self.reference_doctype, d.name)
-            self.send_template_message(doc)
-            # print(doc.name)
+    def needs_formatted_values(self):
+        """Check if any template parameter has to be formatted by the document.
+
+        Standard fields like `creation` have no docfield and are formatted
+        through a default one, so only known plain docfields skip formatting.
+        """
+        meta = frappe.get_meta(self.reference_doctype)
+        for field in self.fields:
+            df = meta.get_field(field.field_name)
+            if not df or df.fieldtype not in PLAIN_FIELDTYPES:
+                return True
+
+        return False
 
 
 @frappe.whitelist()
@@ -502,10 +824,48 @@ def trigger_notifications(method="daily"):
         return
 
     if method == "daily":
-        doc_list = frappe.get_all(
-            "WhatsApp Notification", filters={"doctype_event": ("in", ("Days Before", "Days After")), "disabled": 0}
-        )
-        for d in doc_list:
-            alert = frappe.get_doc("WhatsApp Notification", d.name)
+        for data in get_daily_notifications():
+            alert = frappe.get_doc(data)
             alert.get_documents_for_today()
+
+
+def get_daily_notifications():
+    """Get enabled Days Before / Days After notifications.
+
+    Only the names are cached. Each notification is loaded from frappe's
+    document cache and `disabled` is checked again before it is run.
+    """
+    names = frappe.cache().get_value(DAILY_NOTIFICATIONS_CACHE_KEY)
+    if names is None:
+        names = frappe.get_all(
+            "WhatsApp Notification",
+            filters={"doctype_event": ("in", ("Days Before", "Days After")), "disabled": 0},
+            pluck="name"
+        )
+        frappe.cache().set_value(
+            DAILY_NOTIFICATIONS_CACHE_KEY, names,
+            expires_in_sec=DAILY_NOTIFICATIONS_CACHE_EXPIRY
+        )
+
+    notifications = []
+    for name in names:
+        try:
+            alert = frappe.get_cached_doc("WhatsApp Notification", name)
+        except frappe.DoesNotExistError:
+            frappe.clear_last_message()
+            continue
+
+        if alert.disabled or alert.doctype_event not in ("Days Before", "Days After"):
+            continue
+
+        # copy, the send path memoizes lookups on the instance
+        notifications.append(alert.as_dict())
+
+    return notifications
+
+
+def clear_notifications_cache():
+    """Clear cached notification maps."""
+    frappe.cache().delete_value("whatsapp_notification_map")
+    frappe.cache().delete_value(DAILY_NOTIFICATIONS_CACHE_KEY)
            